@@ -1,19 +1,22 @@
 from fastapi import FastAPI, Depends, HTTPException, status, Header
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
-from datetime import datetime, date, time
+from datetime import datetime, date, time, timezone
+from functools import lru_cache
 from typing import List, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from enum import Enum
+import asyncio
 import asyncpg
 import redis.asyncio as aioredis
 import os
-import json
+import orjson
 import logging
-from jose import JWTError, jwt
+import jwt
 import sys
 sys.path.append(os.path.dirname(__file__))
-from utils.http_client import validate_user, get_active_programs
+from utils.http_client import validate_user, get_active_programs, init_http_client, close_http_client, set_redis_client
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -27,6 +30,13 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
     raise ValueError("DATABASE_URL environment variable is required")
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
+# Concrete origin list - a wildcard with credentials is rejected by browsers
+# anyway, and exact-match origins let CORSMiddleware take its fast path
+ALLOWED_ORIGINS = [
+    origin.strip()
+    for origin in os.getenv("ALLOWED_ORIGINS", "http://localhost:3000").split(",")
+    if origin.strip()
+]
 JWT_SECRET = os.getenv("JWT_SECRET", "your-super-secret-jwt-key")
 
 # Global connections
@@ -68,6 +78,14 @@ class BookingCreate(BaseModel):
     end_time: time
     notes: Optional[str] = None
 
+    @model_validator(mode="after")
+    def check_time_order(self):
+        # tsrange construction requires an ordered range; reject inverted
+        # or empty slots at validation instead of erroring in the database
+        if self.end_time <= self.start_time:
+            raise ValueError("end_time must be after start_time")
+        return self
+
 class BookingUpdate(BaseModel):
     booking_date: Optional[date] = None
     start_time: Optional[time] = None
@@ -86,6 +104,77 @@ class GroupSessionCreate(BaseModel):
     start_time: time
     end_time: time
 
+# SQL statements
+# Explicit column lists instead of SELECT * - avoids shipping wide columns
+# the endpoint never returns, and identical statement text lets asyncpg's
+# per-connection statement cache reuse the prepared plan across requests
+BOOKING_COLUMNS = """id, type, trainer_id, client_id, gym_id, booking_date,
+                     start_time, end_time, status, notes, created_at, updated_at,
+                     cancelled_at, cancellation_reason"""
+# List view omits notes (TEXT) - it is only shown on the detail endpoint
+BOOKING_LIST_COLUMNS = """id, type, trainer_id, client_id, gym_id, booking_date,
+                          start_time, end_time, status, created_at, updated_at,
+                          cancelled_at, cancellation_reason"""
+AVAILABILITY_COLUMNS = """id, trainer_id, gym_id, day_of_week, start_time, end_time,
+                          is_recurring, specific_date, max_slots, is_active, created_at"""
+GROUP_SESSION_COLUMNS = """id, trainer_id, session_name, description, max_participants,
+                           current_participants, gym_id, session_date, start_time,
+                           end_time, status, enrolled_clients, created_at"""
+
+GET_TRAINER_AVAILABILITY_SQL = f"""SELECT {AVAILABILITY_COLUMNS} FROM availability
+                                   WHERE trainer_id = $1 AND is_active = true
+                                   ORDER BY day_of_week, start_time"""
+GET_BOOKING_SQL = f"SELECT {BOOKING_COLUMNS} FROM bookings WHERE id = $1"
+LIST_GROUP_SESSIONS_SQL = f"""SELECT {GROUP_SESSION_COLUMNS}, count(*) OVER () AS total_count
+                              FROM group_sessions WHERE status = 'scheduled'
+                              ORDER BY session_date, start_time LIMIT $1 OFFSET $2"""
+
+def _build_list_bookings_sql():
+    """Precompile every list_bookings variant (role x status filter) at import
+    time - there are only six, so each request dispatches to a static
+    statement instead of assembling WHERE clauses and parameter counters."""
+    queries, counts = {}, {}
+    for role, owner_col in (("client", "client_id"), ("trainer", "trainer_id"), ("admin", None)):
+        for with_status in (False, True):
+            conds = []
+            if owner_col:
+                conds.append(f"{owner_col} = ${len(conds) + 1}")
+            if with_status:
+                conds.append(f"status = ${len(conds) + 1}")
+            where = f"WHERE {' AND '.join(conds)}" if conds else ""
+            n = len(conds)
+            queries[(role, with_status)] = (
+                f"SELECT {BOOKING_LIST_COLUMNS}, count(*) OVER () AS total_count "
+                f"FROM bookings {where} "
+                f"ORDER BY booking_date DESC, start_time LIMIT ${n + 1} OFFSET ${n + 2}"
+            )
+            counts[(role, with_status)] = f"SELECT COUNT(*) FROM bookings {where}"
+    return queries, counts
+
+LIST_BOOKINGS_SQL, LIST_BOOKINGS_COUNT_SQL = _build_list_bookings_sql()
+
+def _rows_to_dicts(records, exclude: Optional[str] = None):
+    """Convert asyncpg Records to dicts with one keys() lookup and zip,
+    instead of dict(record)'s per-field __getitem__ on every row."""
+    if not records:
+        return []
+    cols = tuple(records[0].keys())
+    rows = [dict(zip(cols, r.values())) for r in records]
+    if exclude:
+        for row in rows:
+            row.pop(exclude, None)
+    return rows
+
+async def _setup_connection(conn):
+    # Route json/jsonb values through orjson instead of stdlib json
+    for pg_type in ("json", "jsonb"):
+        await conn.set_type_codec(
+            pg_type,
+            encoder=lambda v: orjson.dumps(v).decode(),
+            decoder=orjson.loads,
+            schema="pg_catalog"
+        )
+
 # Database initialization
 async def init_db():
     global db_pool
@@ -95,7 +184,11 @@ async def init_db():
         dsn=DATABASE_URL,
         min_size=5,
         max_size=20,
-        ssl='prefer'  # Use SSL if available, allow self-signed certs
+        ssl='prefer',  # Use SSL if available, allow self-signed certs
+        max_inactive_connection_lifetime=300,
+        statement_cache_size=1024,       # keep every hot statement prepared
+        max_cached_statement_lifetime=3600,
+        setup=_setup_connection
     )
     ssl_status = "with TLS" if "sslmode" in DATABASE_URL else "without TLS"
     logger.info(f"Database pool created {ssl_status}")
@@ -109,10 +202,48 @@ async def close_db():
         await db_pool.close()
         logger.info("Database pool closed")
 
+# Bump when the DDL below changes so existing databases re-apply it
+SCHEMA_VERSION = "schema_v5"
+
+async def _apply_overlap_constraint(conn):
+    """Defense-in-depth EXCLUDE constraint making the booking conflict check
+    atomic under concurrency. Tracked outside the schema version and
+    re-attempted on every boot: it cannot be created while the table still
+    holds overlapping bookings, so it may only succeed after cleanup."""
+    exists = await conn.fetchval(
+        "SELECT 1 FROM pg_constraint WHERE conname = 'bookings_no_overlap'"
+    )
+    if exists:
+        return
+    try:
+        await conn.execute("""
+            ALTER TABLE bookings ADD CONSTRAINT bookings_no_overlap
+                EXCLUDE USING gist (
+                    trainer_id WITH =,
+                    tsrange(LEAST(booking_date + start_time, booking_date + end_time),
+                            GREATEST(booking_date + start_time, booking_date + end_time)) WITH &&
+                ) WHERE (status != 'cancelled');
+        """)
+        logger.info("bookings_no_overlap constraint applied")
+    except Exception as e:
+        logger.warning(f"Could not apply bookings_no_overlap constraint (overlapping rows present?): {e}")
+
 async def run_migrations():
     async with db_pool.acquire() as conn:
-        try:
-            await conn.execute("""
+        # Fast path: once the schema version is recorded, skip sending
+        # the DDL blob on every boot - it is a no-op after first run
+        if await conn.fetchval("SELECT to_regclass('migrations')"):
+            applied = await conn.fetchval(
+                "SELECT 1 FROM migrations WHERE name = $1", SCHEMA_VERSION
+            )
+            if applied:
+                logger.info(f"Schema {SCHEMA_VERSION} already applied, skipping migrations")
+                await _apply_overlap_constraint(conn)
+                return
+
+        # The application SQL hard-depends on this schema (time_range,
+        # session_enrollments, ...), so errors here propagate and fail startup
+        await conn.execute("""
                 CREATE TABLE IF NOT EXISTS migrations (
                     id SERIAL PRIMARY KEY,
                     name VARCHAR(255) UNIQUE NOT NULL,
@@ -135,8 +266,10 @@ async def run_migrations():
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 );
 
-                CREATE INDEX IF NOT EXISTS idx_availability_trainer ON availability(trainer_id);
+                -- Partial index matching the only availability query: active rows for a trainer
+                CREATE INDEX IF NOT EXISTS idx_availability_trainer_active ON availability(trainer_id) WHERE is_active;
                 CREATE INDEX IF NOT EXISTS idx_availability_date ON availability(specific_date);
+                DROP INDEX IF EXISTS idx_availability_trainer;
 
                 CREATE TABLE IF NOT EXISTS bookings (
                     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
@@ -152,13 +285,37 @@ async def run_migrations():
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     cancelled_at TIMESTAMP,
-                    cancellation_reason TEXT
+                    cancellation_reason TEXT,
+                    -- LEAST/GREATEST normalizes the bounds: the baseline API accepted
+                    -- end_time before start_time (OVERLAPS normalized its operands), and
+                    -- a bare tsrange would raise on such legacy rows while the ALTER
+                    -- below rewrites the table, aborting startup
+                    time_range TSRANGE GENERATED ALWAYS AS
+                        (tsrange(LEAST(booking_date + start_time, booking_date + end_time)::timestamp,
+                                 GREATEST(booking_date + start_time, booking_date + end_time)::timestamp)) STORED
                 );
 
-                CREATE INDEX IF NOT EXISTS idx_bookings_client ON bookings(client_id);
-                CREATE INDEX IF NOT EXISTS idx_bookings_trainer ON bookings(trainer_id);
-                CREATE INDEX IF NOT EXISTS idx_bookings_date ON bookings(booking_date);
-                CREATE INDEX IF NOT EXISTS idx_bookings_status ON bookings(status);
+                ALTER TABLE bookings ADD COLUMN IF NOT EXISTS time_range TSRANGE GENERATED ALWAYS AS
+                    (tsrange(LEAST(booking_date + start_time, booking_date + end_time)::timestamp,
+                             GREATEST(booking_date + start_time, booking_date + end_time)::timestamp)) STORED;
+
+                CREATE EXTENSION IF NOT EXISTS btree_gist;
+
+                -- GiST index so the conflict check resolves overlaps in O(log n)
+                -- instead of scanning the trainer's bookings for the day
+                CREATE INDEX IF NOT EXISTS idx_bookings_trainer_range ON bookings
+                    USING gist (trainer_id, time_range) WHERE status != 'cancelled';
+
+                -- Composite indexes matching the real predicates: conflict check filters
+                -- (trainer_id, booking_date) on non-cancelled rows; list_bookings filters
+                -- by client/trainer + optional status ordered by booking_date DESC
+                CREATE INDEX IF NOT EXISTS idx_bookings_trainer_date ON bookings(trainer_id, booking_date) WHERE status != 'cancelled';
+                CREATE INDEX IF NOT EXISTS idx_bookings_client_status_date ON bookings(client_id, status, booking_date DESC);
+                CREATE INDEX IF NOT EXISTS idx_bookings_trainer_status_date ON bookings(trainer_id, status, booking_date DESC);
+                DROP INDEX IF EXISTS idx_bookings_client;
+                DROP INDEX IF EXISTS idx_bookings_trainer;
+                DROP INDEX IF EXISTS idx_bookings_date;
+                DROP INDEX IF EXISTS idx_bookings_status;
 
                 CREATE TABLE IF NOT EXISTS group_sessions (
                     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
@@ -178,10 +335,33 @@ async def run_migrations():
 
                 CREATE INDEX IF NOT EXISTS idx_group_sessions_trainer ON group_sessions(trainer_id);
                 CREATE INDEX IF NOT EXISTS idx_group_sessions_date ON group_sessions(session_date);
-            """)
-            logger.info("Migrations completed")
-        except Exception as e:
-            logger.error(f"Migration error: {e}")
+
+                -- Normalized enrollments: UNIQUE(session_id, client_id) gives indexed
+                -- duplicate detection; enrolled_clients on group_sessions stays as a
+                -- denormalized copy for read responses
+                CREATE TABLE IF NOT EXISTS session_enrollments (
+                    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+                    session_id UUID NOT NULL REFERENCES group_sessions(id),
+                    client_id UUID NOT NULL,
+                    enrollment_status VARCHAR(20) DEFAULT 'confirmed',
+                    enrolled_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE(session_id, client_id)
+                );
+
+                -- Backfill from the legacy enrolled_clients arrays so clients
+                -- enrolled before the table existed cannot enroll twice
+                INSERT INTO session_enrollments (session_id, client_id)
+                SELECT id, unnest(enrolled_clients) FROM group_sessions
+                ON CONFLICT (session_id, client_id) DO NOTHING;
+        """)
+
+        await _apply_overlap_constraint(conn)
+
+        await conn.execute(
+            "INSERT INTO migrations (name) VALUES ($1) ON CONFLICT (name) DO NOTHING",
+            SCHEMA_VERSION
+        )
+        logger.info("Migrations completed")
 
 # Redis initialization
 async def init_redis():
@@ -198,33 +378,113 @@ async def close_redis():
         await redis_client.close()
         logger.info("Redis closed")
 
+# Response cache - read-heavy, rarely-changing GETs are served from Redis
+# for up to CACHE_TTL seconds; writers invalidate the affected keys.
+# Cache failures degrade to a normal DB read, never an error.
+CACHE_TTL = 60
+
+async def cache_get(key: str):
+    try:
+        cached = await redis_client.get(key)
+        return orjson.loads(cached) if cached else None
+    except Exception as e:
+        logger.warning(f"Cache read failed for {key}: {e}")
+        return None
+
+async def cache_set(key: str, value: dict):
+    try:
+        await redis_client.set(key, orjson.dumps(value, default=str), ex=CACHE_TTL)
+    except Exception as e:
+        logger.warning(f"Cache write failed for {key}: {e}")
+
+async def cache_invalidate(pattern: str):
+    try:
+        if "*" in pattern:
+            # Only wildcard patterns need the keyspace SCAN
+            keys = [key async for key in redis_client.scan_iter(pattern)]
+            if keys:
+                await redis_client.delete(*keys)
+        else:
+            await redis_client.delete(pattern)
+    except Exception as e:
+        logger.warning(f"Cache invalidation failed for {pattern}: {e}")
+
+# Event publishing - events are enqueued and flushed in batches by a
+# background worker, so request handlers never wait on a Redis round-trip
+publish_queue: Optional[asyncio.Queue] = None
+publish_worker_task = None
+PUBLISH_BATCH_SIZE = 100
+PUBLISH_FLUSH_INTERVAL = 0.01  # seconds to wait for more events before flushing
+
+async def publish_worker():
+    while True:
+        batch = [await publish_queue.get()]
+        try:
+            while len(batch) < PUBLISH_BATCH_SIZE:
+                batch.append(await asyncio.wait_for(
+                    publish_queue.get(), timeout=PUBLISH_FLUSH_INTERVAL
+                ))
+        except asyncio.TimeoutError:
+            pass
+
+        try:
+            async with redis_client.pipeline(transaction=False) as pipe:
+                for channel, data in batch:
+                    pipe.publish(channel, orjson.dumps(data))
+                await pipe.execute()
+            logger.info(f"Published {len(batch)} event(s)")
+        except Exception as e:
+            logger.error(f"Failed to publish events: {e}")
+        finally:
+            for _ in batch:
+                publish_queue.task_done()
+
 # Publish event
-async def publish_event(channel: str, data: dict):
+def publish_event(channel: str, data: dict):
     try:
-        await redis_client.publish(channel, json.dumps(data))
-        logger.info(f"Event published to {channel}")
+        publish_queue.put_nowait((channel, data))
     except Exception as e:
-        logger.error(f"Failed to publish event: {e}")
+        logger.error(f"Failed to enqueue event: {e}")
 
 # Auth dependency
+# Decoding is deterministic for a given token, so cache verified payloads
+# and skip the HMAC + JSON parse when the same token comes back; expiry is
+# re-checked on every lookup since the cached result outlives the claim
+@lru_cache(maxsize=4096)
+def _decode_token(token: str):
+    return jwt.decode(token, JWT_SECRET, algorithms=["HS256"],
+                      issuer="fitsync-user-service", audience="fitsync-api")
+
 def get_current_user(authorization: Optional[str] = None):
     if not authorization or not authorization.startswith("Bearer "):
         raise HTTPException(status_code=401, detail="No token provided")
 
     token = authorization.split(" ")[1]
     try:
-        payload = jwt.decode(token, JWT_SECRET, algorithms=["HS256"],
-                           issuer="fitsync-user-service", audience="fitsync-api")
-        return payload
-    except JWTError:
+        payload = _decode_token(token)
+    except jwt.PyJWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
+    exp = payload.get("exp")
+    if exp is not None and exp <= datetime.now(timezone.utc).timestamp():
+        raise HTTPException(status_code=401, detail="Token expired")
+    return payload
+
 # Lifespan
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    global publish_queue, publish_worker_task
     await init_db()
     await init_redis()
+    await init_http_client()
+    set_redis_client(redis_client)
+    publish_queue = asyncio.Queue()
+    publish_worker_task = asyncio.create_task(publish_worker())
     yield
+    # Drain pending events before tearing down connections
+    await publish_queue.join()
+    publish_worker_task.cancel()
+    await close_http_client()
     await close_db()
     await close_redis()
 
@@ -232,15 +492,16 @@ async def lifespan(app: FastAPI):
 app = FastAPI(
     title="FitSync Schedule Service",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=ALLOWED_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "DELETE"],
+    allow_headers=["Authorization", "Content-Type"],
 )
 
 # Health check
@@ -274,6 +535,7 @@ async def create_availability(
             trainer_id, availability.gym_id, availability.day_of_week, availability.start_time,
             availability.end_time, availability.is_recurring, availability.specific_date, availability.max_slots
         )
+        await cache_invalidate(f"avail:{trainer_id}")
         return {"success": True, "data": dict(result)}
 
 @app.get("/api/availability/trainer/{trainer_id}")
@@ -283,12 +545,16 @@ async def get_trainer_availability(
 ):
     get_current_user(authorization)
 
+    cache_key = f"avail:{trainer_id}"
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        return cached
+
     async with db_pool.acquire() as conn:
-        results = await conn.fetch(
-            "SELECT * FROM availability WHERE trainer_id = $1 AND is_active = true ORDER BY day_of_week, start_time",
-            trainer_id
-        )
-        return {"success": True, "data": [dict(r) for r in results]}
+        results = await conn.fetch(GET_TRAINER_AVAILABILITY_SQL, trainer_id)
+        response = {"success": True, "data": _rows_to_dicts(results)}
+        await cache_set(cache_key, response)
+        return response
 
 @app.delete("/api/availability/{availability_id}")
 async def delete_availability(
@@ -300,12 +566,13 @@ async def delete_availability(
         raise HTTPException(status_code=403, detail="Insufficient permissions")
 
     async with db_pool.acquire() as conn:
-        result = await conn.execute(
-            "UPDATE availability SET is_active = false WHERE id = $1",
+        result = await conn.fetchrow(
+            "UPDATE availability SET is_active = false WHERE id = $1 RETURNING trainer_id",
             availability_id
         )
-        if result == "UPDATE 0":
+        if not result:
             raise HTTPException(status_code=404, detail="Availability not found")
+        await cache_invalidate(f"avail:{result['trainer_id']}")
         return {"success": True, "message": "Availability removed"}
 
 # BOOKING ENDPOINTS
@@ -318,62 +585,78 @@ async def create_booking(
     user = get_current_user(authorization)
     client_id = user["id"]
 
+    async def _trainer_lookup():
+        # The JWT already proves the role when a trainer books their own
+        # session - no need to ask the user service who they are
+        if user["role"] == "trainer" and user["id"] == booking.trainer_id:
+            return {"success": True, "data": {"id": user["id"], "role": "trainer"}}
+        return await validate_user(booking.trainer_id, authorization)
+
+    # Validate trainer and look up active programs concurrently - both hit
+    # independent services, so total wait is the slower call, not the sum
+    trainer_task = asyncio.create_task(_trainer_lookup())
+    programs_task = asyncio.create_task(get_active_programs(client_id, authorization))
+    trainer_data, programs = await asyncio.gather(
+        trainer_task, programs_task, return_exceptions=True
+    )
+
     # Validate trainer exists
-    try:
-        trainer_data = await validate_user(booking.trainer_id, authorization)
-        if trainer_data["data"]["role"] != "trainer":
-            raise HTTPException(status_code=400, detail="Specified user is not a trainer")
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
-    except ConnectionError:
+    if isinstance(trainer_data, ValueError):
+        raise HTTPException(status_code=404, detail=str(trainer_data))
+    elif isinstance(trainer_data, ConnectionError):
         logger.warning("User service unavailable, skipping trainer validation")
+    elif isinstance(trainer_data, Exception):
+        raise trainer_data
+    elif trainer_data["data"]["role"] != "trainer":
+        raise HTTPException(status_code=400, detail="Specified user is not a trainer")
 
     # Validate client has active program with trainer (optional check)
-    try:
-        programs = await get_active_programs(client_id, authorization)
-        if programs["success"] and len(programs["data"]) > 0:
-            has_program_with_trainer = any(
-                p.get("trainer_id") == booking.trainer_id for p in programs["data"]
-            )
-            if not has_program_with_trainer:
-                logger.warning(f"Client {client_id} booking with trainer {booking.trainer_id} without active program")
-    except Exception as e:
-        logger.warning(f"Could not verify active program: {e}")
-
-    async with db_pool.acquire() as conn:
-        # Check for conflicts
-        conflict = await conn.fetchrow(
-            """SELECT id FROM bookings
-               WHERE trainer_id = $1 AND booking_date = $2
-               AND status != 'cancelled'
-               AND ((start_time, end_time) OVERLAPS ($3::time, $4::time))""",
-            booking.trainer_id, booking.booking_date, booking.start_time, booking.end_time
+    if isinstance(programs, Exception):
+        logger.warning(f"Could not verify active program: {programs}")
+    elif programs["success"] and len(programs["data"]) > 0:
+        has_program_with_trainer = any(
+            p.get("trainer_id") == booking.trainer_id for p in programs["data"]
         )
+        if not has_program_with_trainer:
+            logger.warning(f"Client {client_id} booking with trainer {booking.trainer_id} without active program")
 
-        if conflict:
+    async with db_pool.acquire() as conn:
+        # Conflict check and insert in one atomic statement - the database
+        # decides, so there is no check-then-insert race or second round-trip
+        try:
+            result = await conn.fetchrow(
+                """INSERT INTO bookings (type, trainer_id, client_id, gym_id, booking_date,
+                                         start_time, end_time, notes)
+                   SELECT $1, $2, $3, $4, $5, $6, $7, $8
+                   WHERE NOT EXISTS (
+                       SELECT 1 FROM bookings
+                       WHERE trainer_id = $2
+                       AND status != 'cancelled'
+                       AND time_range && tsrange(($5::date + $6::time), ($5::date + $7::time))
+                   )
+                   RETURNING """ + BOOKING_COLUMNS,
+                booking.type.value, booking.trainer_id, client_id, booking.gym_id,
+                booking.booking_date, booking.start_time, booking.end_time, booking.notes
+            )
+        except asyncpg.ExclusionViolationError:
             raise HTTPException(status_code=409, detail="Time slot already booked")
 
-        result = await conn.fetchrow(
-            """INSERT INTO bookings (type, trainer_id, client_id, gym_id, booking_date,
-                                     start_time, end_time, notes)
-               VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
-               RETURNING *""",
-            booking.type.value, booking.trainer_id, client_id, booking.gym_id,
-            booking.booking_date, booking.start_time, booking.end_time, booking.notes
-        )
+    if not result:
+        raise HTTPException(status_code=409, detail="Time slot already booked")
 
-        # Publish event
-        await publish_event("booking.created", {
-            "booking_id": str(result["id"]),
-            "client_id": client_id,
-            "trainer_id": booking.trainer_id,
-            "booking_date": booking.booking_date.isoformat(),
-            "start_time": booking.start_time.isoformat(),
-            "end_time": booking.end_time.isoformat(),
-            "type": booking.type.value
-        })
+    # Publish event (enqueued, flushed by background worker) after the
+    # pool connection is released - the event never blocks the response
+    publish_event("booking.created", {
+        "booking_id": result["id"],
+        "client_id": client_id,
+        "trainer_id": booking.trainer_id,
+        "booking_date": booking.booking_date,
+        "start_time": booking.start_time,
+        "end_time": booking.end_time,
+        "type": booking.type.value
+    })
 
-        return {"success": True, "data": dict(result)}
+    return {"success": True, "data": dict(result)}
 
 @app.get("/api/bookings")
 async def list_bookings(
@@ -385,39 +668,30 @@ async def list_bookings(
     user = get_current_user(authorization)
 
     offset = (page - 1) * limit
-    conditions = []
-    params = []
-    param_count = 1
 
-    if user["role"] == "client":
-        conditions.append(f"client_id = ${param_count}")
-        params.append(user["id"])
-        param_count += 1
-    elif user["role"] == "trainer":
-        conditions.append(f"trainer_id = ${param_count}")
+    role = user["role"] if user["role"] in ("client", "trainer") else "admin"
+    sql_key = (role, status is not None)
+    params = []
+    if role != "admin":
         params.append(user["id"])
-        param_count += 1
-
     if status:
-        conditions.append(f"status = ${param_count}")
         params.append(status.value)
-        param_count += 1
-
-    where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
 
     async with db_pool.acquire() as conn:
-        results = await conn.fetch(
-            f"SELECT * FROM bookings {where_clause} ORDER BY booking_date DESC, start_time LIMIT ${param_count} OFFSET ${param_count + 1}",
-            *params, limit, offset
-        )
-        count = await conn.fetchval(
-            f"SELECT COUNT(*) FROM bookings {where_clause}",
-            *params
-        )
+        # count(*) OVER () piggybacks the total on the page fetch, so one
+        # query serves both the rows and the pagination metadata
+        results = await conn.fetch(LIST_BOOKINGS_SQL[sql_key], *params, limit, offset)
+        if results:
+            count = results[0]["total_count"]
+        elif page > 1:
+            # Page past the end - the window count is unavailable, fall back
+            count = await conn.fetchval(LIST_BOOKINGS_COUNT_SQL[sql_key], *params)
+        else:
+            count = 0
 
         return {
             "success": True,
-            "data": [dict(r) for r in results],
+            "data": _rows_to_dicts(results, exclude="total_count"),
             "pagination": {
                 "page": page,
                 "limit": limit,
@@ -434,10 +708,7 @@ async def get_booking(
     get_current_user(authorization)
 
     async with db_pool.acquire() as conn:
-        result = await conn.fetchrow(
-            "SELECT * FROM bookings WHERE id = $1",
-            booking_id
-        )
+        result = await conn.fetchrow(GET_BOOKING_SQL, booking_id)
         if not result:
             raise HTTPException(status_code=404, detail="Booking not found")
         return {"success": True, "data": dict(result)}
@@ -455,21 +726,21 @@ async def cancel_booking(
             """UPDATE bookings
                SET status = 'cancelled', cancelled_at = NOW(), cancellation_reason = $1
                WHERE id = $2
-               RETURNING *""",
+               RETURNING """ + BOOKING_COLUMNS,
             cancel.cancellation_reason, booking_id
         )
 
-        if not result:
-            raise HTTPException(status_code=404, detail="Booking not found")
+    if not result:
+        raise HTTPException(status_code=404, detail="Booking not found")
 
-        # Publish event
-        await publish_event("booking.cancelled", {
-            "booking_id": booking_id,
-            "client_id": str(result["client_id"]),
-            "reason": cancel.cancellation_reason
-        })
+    # Publish event (enqueued, flushed by background worker)
+    publish_event("booking.cancelled", {
+        "booking_id": booking_id,
+        "client_id": result["client_id"],
+        "reason": cancel.cancellation_reason
+    })
 
-        return {"success": True, "data": dict(result)}
+    return {"success": True, "data": dict(result)}
 
 @app.put("/api/bookings/{booking_id}/complete")
 async def complete_booking(
@@ -482,31 +753,31 @@ async def complete_booking(
 
     async with db_pool.acquire() as conn:
         result = await conn.fetchrow(
-            "UPDATE bookings SET status = 'completed' WHERE id = $1 RETURNING *",
+            f"UPDATE bookings SET status = 'completed' WHERE id = $1 RETURNING {BOOKING_COLUMNS}",
             booking_id
         )
 
-        if not result:
-            raise HTTPException(status_code=404, detail="Booking not found")
+    if not result:
+        raise HTTPException(status_code=404, detail="Booking not found")
 
-        # Calculate duration in minutes
-        start_dt = datetime.combine(result["booking_date"], result["start_time"])
-        end_dt = datetime.combine(result["booking_date"], result["end_time"])
-        duration_minutes = int((end_dt - start_dt).total_seconds() / 60)
-
-        # Publish booking completed event
-        await publish_event("booking.completed", {
-            "booking_id": str(result["id"]),
-            "client_id": str(result["client_id"]),
-            "trainer_id": str(result["trainer_id"]),
-            "workout_date": result["booking_date"].isoformat(),
-            "start_time": result["start_time"].isoformat(),
-            "end_time": result["end_time"].isoformat(),
-            "duration_minutes": duration_minutes,
-            "trainer_notes": result.get("notes", "")
-        })
+    # Calculate duration in minutes
+    start_dt = datetime.combine(result["booking_date"], result["start_time"])
+    end_dt = datetime.combine(result["booking_date"], result["end_time"])
+    duration_minutes = int((end_dt - start_dt).total_seconds() / 60)
 
-        return {"success": True, "data": dict(result)}
+    # Publish booking completed event
+    publish_event("booking.completed", {
+        "booking_id": result["id"],
+        "client_id": result["client_id"],
+        "trainer_id": result["trainer_id"],
+        "workout_date": result["booking_date"],
+        "start_time": result["start_time"],
+        "end_time": result["end_time"],
+        "duration_minutes": duration_minutes,
+        "trainer_notes": result.get("notes", "")
+    })
+
+    return {"success": True, "data": dict(result)}
 
 # GROUP SESSION ENDPOINTS
 
@@ -528,6 +799,7 @@ async def create_group_session(
             session.trainer_id, session.session_name, session.description, session.max_participants,
             session.gym_id, session.session_date, session.start_time, session.end_time
         )
+        await cache_invalidate("sessions:list:*")
         return {"success": True, "data": dict(result)}
 
 @app.get("/api/sessions/group")
@@ -538,20 +810,27 @@ async def list_group_sessions(
 ):
     get_current_user(authorization)
 
+    cache_key = f"sessions:list:{page}:{limit}"
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        return cached
+
     offset = (page - 1) * limit
 
     async with db_pool.acquire() as conn:
-        results = await conn.fetch(
-            "SELECT * FROM group_sessions WHERE status = 'scheduled' ORDER BY session_date, start_time LIMIT $1 OFFSET $2",
-            limit, offset
-        )
-        count = await conn.fetchval(
-            "SELECT COUNT(*) FROM group_sessions WHERE status = 'scheduled'"
-        )
+        results = await conn.fetch(LIST_GROUP_SESSIONS_SQL, limit, offset)
+        if results:
+            count = results[0]["total_count"]
+        elif page > 1:
+            count = await conn.fetchval(
+                "SELECT COUNT(*) FROM group_sessions WHERE status = 'scheduled'"
+            )
+        else:
+            count = 0
 
-        return {
+        response = {
             "success": True,
-            "data": [dict(r) for r in results],
+            "data": _rows_to_dicts(results, exclude="total_count"),
             "pagination": {
                 "page": page,
                 "limit": limit,
@@ -559,6 +838,8 @@ async def list_group_sessions(
                 "total_pages": (count + limit - 1) // limit
             }
         }
+        await cache_set(cache_key, response)
+        return response
 
 @app.post("/api/sessions/group/{session_id}/enroll")
 async def enroll_in_group_session(
@@ -569,30 +850,37 @@ async def enroll_in_group_session(
     client_id = user["id"]
 
     async with db_pool.acquire() as conn:
-        session = await conn.fetchrow(
-            "SELECT * FROM group_sessions WHERE id = $1",
-            session_id
-        )
-
-        if not session:
-            raise HTTPException(status_code=404, detail="Session not found")
-
-        if session["current_participants"] >= session["max_participants"]:
-            raise HTTPException(status_code=400, detail="Session is full")
+        async with conn.transaction():
+            # The UNIQUE(session_id, client_id) index detects duplicate
+            # enrollment in O(log n) instead of scanning the client array
+            try:
+                await conn.execute(
+                    """INSERT INTO session_enrollments (session_id, client_id, enrollment_status)
+                       VALUES ($1, $2, 'confirmed')""",
+                    session_id, client_id
+                )
+            except asyncpg.UniqueViolationError:
+                raise HTTPException(status_code=400, detail="Already enrolled")
+            except asyncpg.ForeignKeyViolationError:
+                raise HTTPException(status_code=404, detail="Session not found")
+
+            # Capacity guard in the UPDATE; the denormalized enrolled_clients
+            # array is kept for read responses. A miss rolls back the insert.
+            result = await conn.fetchrow(
+                """UPDATE group_sessions
+                   SET enrolled_clients = array_append(enrolled_clients, $1),
+                       current_participants = current_participants + 1
+                   WHERE id = $2
+                   AND current_participants < max_participants
+                   RETURNING *""",
+                client_id, session_id
+            )
 
-        if client_id in session["enrolled_clients"]:
-            raise HTTPException(status_code=400, detail="Already enrolled")
+            if not result:
+                raise HTTPException(status_code=400, detail="Session is full")
 
-        result = await conn.fetchrow(
-            """UPDATE group_sessions
-               SET enrolled_clients = array_append(enrolled_clients, $1),
-                   current_participants = current_participants + 1
-               WHERE id = $2
-               RETURNING *""",
-            client_id, session_id
-        )
-
-        return {"success": True, "data": dict(result)}
+    await cache_invalidate("sessions:list:*")
+    return {"success": True, "data": dict(result)}
 
 if __name__ == "__main__":
     import uvicorn
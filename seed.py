@@ -24,79 +24,52 @@ async def seed_data():
     try:
         # Create trainer availability for next 2 weeks
         print("Creating trainer availability...")
-        availability_count = 0
 
+        # Batch all slots into one executemany instead of one INSERT per slot;
+        # ON CONFLICT DO NOTHING replaces the per-row try/except for reruns
+        availability_rows = []
         for day_offset in range(14):
             date = datetime.now().date() + timedelta(days=day_offset)
             # Skip weekends
             if date.weekday() >= 5:
                 continue
 
-            # Morning slots (9 AM - 12 PM)
-            for hour in [9, 10, 11]:
-                try:
-                    await conn.execute("""
-                        INSERT INTO availability (trainer_id, available_date, start_time, end_time, is_booked)
-                        VALUES ($1, $2, $3, $4, false)
-                    """, TRAINER_ID, date, time(hour, 0, 0), time(hour+1, 0, 0))
-                    availability_count += 1
-                except Exception as e:
-                    print(f"Availability slot already exists: {date} {hour}:00")
-
-            # Afternoon slots (2 PM - 5 PM)
-            for hour in [14, 15, 16]:
-                try:
-                    await conn.execute("""
-                        INSERT INTO availability (trainer_id, available_date, start_time, end_time, is_booked)
-                        VALUES ($1, $2, $3, $4, false)
-                    """, TRAINER_ID, date, time(hour, 0, 0), time(hour+1, 0, 0))
-                    availability_count += 1
-                except Exception as e:
-                    print(f"Availability slot already exists: {date} {hour}:00")
-
-        print(f"Created {availability_count} availability slots")
+            # Morning slots (9 AM - 12 PM) and afternoon slots (2 PM - 5 PM)
+            for hour in [9, 10, 11, 14, 15, 16]:
+                availability_rows.append(
+                    (TRAINER_ID, date, time(hour, 0, 0), time(hour + 1, 0, 0))
+                )
 
-        # Create some bookings for the test client
-        print("Creating bookings...")
-        booking_count = 0
+        await conn.executemany("""
+            INSERT INTO availability (trainer_id, available_date, start_time, end_time, is_booked)
+            VALUES ($1, $2, $3, $4, false)
+            ON CONFLICT DO NOTHING
+        """, availability_rows)
 
-        # Past completed booking (1 week ago)
-        past_date = datetime.now().date() - timedelta(days=7)
-        try:
-            await conn.execute("""
-                INSERT INTO bookings (client_id, trainer_id, booking_date, start_time, end_time, type, status, notes)
-                VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
-            """, CLIENT_ID, TRAINER_ID, past_date, time(10, 0, 0), time(11, 0, 0),
-                 "one_on_one", "completed", "Great workout session!")
-            booking_count += 1
-        except Exception as e:
-            print(f"Past booking already exists: {e}")
-
-        # Upcoming booking (tomorrow)
-        tomorrow = datetime.now().date() + timedelta(days=1)
-        try:
-            await conn.execute("""
-                INSERT INTO bookings (client_id, trainer_id, booking_date, start_time, end_time, type, status, notes)
-                VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
-            """, CLIENT_ID, TRAINER_ID, tomorrow, time(10, 0, 0), time(11, 0, 0),
-                 "one_on_one", "scheduled", "Upper body focus")
-            booking_count += 1
-        except Exception as e:
-            print(f"Tomorrow booking already exists: {e}")
+        print(f"Created {len(availability_rows)} availability slots")
 
-        # Another upcoming booking (3 days from now)
-        future_date = datetime.now().date() + timedelta(days=3)
-        try:
-            await conn.execute("""
-                INSERT INTO bookings (client_id, trainer_id, booking_date, start_time, end_time, type, status, notes)
-                VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
-            """, CLIENT_ID, TRAINER_ID, future_date, time(15, 0, 0), time(16, 0, 0),
-                 "one_on_one", "scheduled", "Leg day")
-            booking_count += 1
-        except Exception as e:
-            print(f"Future booking already exists: {e}")
+        # Create some bookings for the test client
+        print("Creating bookings...")
 
-        print(f"Created {booking_count} bookings")
+        booking_rows = [
+            # Past completed booking (1 week ago)
+            (CLIENT_ID, TRAINER_ID, datetime.now().date() - timedelta(days=7),
+             time(10, 0, 0), time(11, 0, 0), "one_on_one", "completed", "Great workout session!"),
+            # Upcoming booking (tomorrow)
+            (CLIENT_ID, TRAINER_ID, datetime.now().date() + timedelta(days=1),
+             time(10, 0, 0), time(11, 0, 0), "one_on_one", "scheduled", "Upper body focus"),
+            # Another upcoming booking (3 days from now)
+            (CLIENT_ID, TRAINER_ID, datetime.now().date() + timedelta(days=3),
+             time(15, 0, 0), time(16, 0, 0), "one_on_one", "scheduled", "Leg day"),
+        ]
+
+        await conn.executemany("""
+            INSERT INTO bookings (client_id, trainer_id, booking_date, start_time, end_time, type, status, notes)
+            VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
+            ON CONFLICT DO NOTHING
+        """, booking_rows)
+
+        print(f"Created {len(booking_rows)} bookings")
 
         # Create a group session
         print("Creating group session...")
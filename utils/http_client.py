@@ -1,27 +1,74 @@
 import httpx
 import os
 import logging
+from typing import Optional
 
 logger = logging.getLogger("schedule-service")
 
 USER_SERVICE_URL = os.getenv("USER_SERVICE_URL", "http://localhost:3001")
 TRAINING_SERVICE_URL = os.getenv("TRAINING_SERVICE_URL", "http://localhost:3002")
 
+# Shared client - created in the app lifespan so connections are pooled
+# and kept alive across requests instead of handshaking per call
+http_client: Optional[httpx.AsyncClient] = None
+
+# Optional Redis handle (set from the app lifespan) used to cache user
+# roles for a few minutes, so repeat validations skip the external call
+redis_client = None
+ROLE_CACHE_TTL = 300
+
+
+def set_redis_client(client):
+    global redis_client
+    redis_client = client
+
+
+async def init_http_client():
+    global http_client
+    http_client = httpx.AsyncClient(
+        timeout=5.0,
+        limits=httpx.Limits(max_keepalive_connections=50, max_connections=100)
+    )
+    logger.info("HTTP client initialized")
+
+
+async def close_http_client():
+    global http_client
+    if http_client:
+        await http_client.aclose()
+        http_client = None
+        logger.info("HTTP client closed")
+
 
 async def validate_user(user_id: str, token: str):
     """Validate if a user exists and get their info"""
+    cache_key = f"u:{user_id}:role"
+    if redis_client:
+        try:
+            cached_role = await redis_client.get(cache_key)
+            if cached_role:
+                return {"success": True, "data": {"id": user_id, "role": cached_role}}
+        except Exception as e:
+            logger.warning(f"Role cache read failed for {user_id}: {e}")
+
     try:
         # Token might already have "Bearer " prefix
         auth_header = token if token.startswith("Bearer ") else f"Bearer {token}"
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{USER_SERVICE_URL}/api/users/{user_id}",
-                headers={"Authorization": auth_header},
-                timeout=5.0
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await http_client.get(
+            f"{USER_SERVICE_URL}/api/users/{user_id}",
+            headers={"Authorization": auth_header}
+        )
+        response.raise_for_status()
+        data = response.json()
+
+        role = data.get("data", {}).get("role")
+        if redis_client and role:
+            try:
+                await redis_client.set(cache_key, role, ex=ROLE_CACHE_TTL)
+            except Exception as e:
+                logger.warning(f"Role cache write failed for {user_id}: {e}")
+        return data
     except httpx.HTTPStatusError as e:
         if e.response.status_code == 404:
             raise ValueError(f"User {user_id} not found")
@@ -37,14 +84,12 @@ async def get_active_programs(client_id: str, token: str):
         # Token might already have "Bearer " prefix
         auth_header = token if token.startswith("Bearer ") else f"Bearer {token}"
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{TRAINING_SERVICE_URL}/api/programs/client/{client_id}/active",
-                headers={"Authorization": auth_header},
-                timeout=5.0
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await http_client.get(
+            f"{TRAINING_SERVICE_URL}/api/programs/client/{client_id}/active",
+            headers={"Authorization": auth_header}
+        )
+        response.raise_for_status()
+        return response.json()
     except httpx.HTTPStatusError:
         return {"success": False, "data": []}
     except (httpx.ConnectError, httpx.TimeoutException):
@@ -58,15 +103,13 @@ async def fetch_users_batch(user_ids: list, token: str):
         # Token might already have "Bearer " prefix
         auth_header = token if token.startswith("Bearer ") else f"Bearer {token}"
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{USER_SERVICE_URL}/api/users/batch",
-                json={"user_ids": user_ids},
-                headers={"Authorization": auth_header},
-                timeout=5.0
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await http_client.post(
+            f"{USER_SERVICE_URL}/api/users/batch",
+            json={"user_ids": user_ids},
+            headers={"Authorization": auth_header}
+        )
+        response.raise_for_status()
+        return response.json()
     except Exception as e:
         logger.error(f"Error fetching users batch: {e}")
         return {"success": False, "data": [], "count": 0}